@@ -101,6 +101,7 @@ class RehauNeasmart2BinarySensorForLiveEmu(BinarySensorEntity):
 		self._name = f"{name}"
 		self._propertyname = propertyname
 		self._installation_unique = live_emu["unique"]
+		self._callback_key = ("live_emu", self._installation_unique)
 		self._unique_name = name.lower().replace(" ", "_")
 		self._attr_unique_id = f"{self._installation_unique}_{self._unique_name}"
 		self._attr_name = self._name
@@ -108,11 +109,11 @@ class RehauNeasmart2BinarySensorForLiveEmu(BinarySensorEntity):
 
 	async def async_added_to_hass(self) -> None:
 		"""Run when this Entity has been added to HA."""
-		self._controller.register_callback(self.async_write_ha_state)
+		self._controller.register_callback(self.async_write_ha_state, self._callback_key)
 
 	async def async_will_remove_from_hass(self):
 		"""Run when this Entity will be removed from HA."""
-		self._controller.remove_callback(self.async_write_ha_state)
+		self._controller.remove_callback(self.async_write_ha_state, self._callback_key)
 	
 	@property
 	def is_on(self) -> bool:
@@ -129,6 +130,7 @@ class RehauNeasmart2BinarySensorForLiveDido(BinarySensorEntity):
 		self._name = f"{name}"
 		self._propertyname = propertyname
 		self._installation_unique = live_dido["unique"]
+		self._callback_key = ("live_dido", self._installation_unique)
 		self._unique_name = name.lower().replace(" ", "_")
 		self._attr_unique_id = f"{self._installation_unique}_{self._unique_name}"
 		self._attr_name = self._name
@@ -136,11 +138,11 @@ class RehauNeasmart2BinarySensorForLiveDido(BinarySensorEntity):
 
 	async def async_added_to_hass(self) -> None:
 		"""Run when this Entity has been added to HA."""
-		self._controller.register_callback(self.async_write_ha_state)
+		self._controller.register_callback(self.async_write_ha_state, self._callback_key)
 
 	async def async_will_remove_from_hass(self):
 		"""Run when this Entity will be removed from HA."""
-		self._controller.remove_callback(self.async_write_ha_state)
+		self._controller.remove_callback(self.async_write_ha_state, self._callback_key)
 	
 	@property
 	def is_on(self) -> bool:
@@ -67,6 +67,7 @@ class IntegrationRehauNeaSmart2Climate(ClimateEntity, RestoreEntity):
         self._state = None
         self._installation_unique = installation_unique
         channel = zone.channels[0]
+        self._callback_key = ("channel", installation_unique, channel.id)
 
         attributes = {
             "id": zone.id,
@@ -99,11 +100,11 @@ class IntegrationRehauNeaSmart2Climate(ClimateEntity, RestoreEntity):
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._controller.register_callback(self.async_write_ha_state)
+        self._controller.register_callback(self.async_write_ha_state, self._callback_key)
 
     async def async_will_remove_from_hass(self):
         """Run when this Entity will be removed from HA."""
-        self._controller.remove_callback(self.async_write_ha_state)
+        self._controller.remove_callback(self.async_write_ha_state, self._callback_key)
 
     @property
     def device_info(self):
@@ -163,7 +164,7 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        _LOGGER.debug(f"Getting current temperature for zone {self._zone_number}")
+        _LOGGER.debug("Getting current temperature for zone %s", self._zone_number)
         zone = self._controller.get_zone(self._zone_number)
         if zone is not None:
             channel = zone.channels[0]
@@ -174,7 +175,7 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
     @property
     def target_temperature(self) -> float | None:
         """Return the target temperature."""
-        _LOGGER.debug(f"Getting target temperature for zone {self._zone_number}")
+        _LOGGER.debug("Getting target temperature for zone %s", self._zone_number)
         zone = self._controller.get_zone(self._zone_number)
         if zone is not None:
             channel = zone.channels[0]
@@ -188,7 +189,7 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
     @property
     def current_humidity(self) -> float | None:
         """Return current humidity."""
-        _LOGGER.debug(f"Getting current humidity for zone {self._zone_number}")
+        _LOGGER.debug("Getting current humidity for zone %s", self._zone_number)
         zone = self._controller.get_zone(self._zone_number)
         if zone is not None:
             channel = zone.channels[0]
@@ -199,7 +200,7 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
     @property
     def hvac_mode(self) -> str | None:
         """Return the current operation mode."""
-        _LOGGER.debug(f"Getting operation mode for zone {self._zone_number}")
+        _LOGGER.debug("Getting operation mode for zone %s", self._zone_number)
         zone = self._controller.get_zone(self._zone_number)
         if zone is not None:
             channel = zone.channels[0]
@@ -210,7 +211,7 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
     @property
     def hvac_action(self) -> str | None:
         """Hvac action."""
-        _LOGGER.debug(f"Getting HVAC action for zone {self._zone_number}")
+        _LOGGER.debug("Getting HVAC action for zone %s", self._zone_number)
         zone = self._controller.get_zone(self._zone_number)
         if zone is not None:
             channel = zone.channels[0]
@@ -230,7 +231,7 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
     @property
     def preset_mode(self) -> str | None:
         """Return the current energy level."""
-        _LOGGER.debug(f"Getting energy level for zone {self._zone_number}")
+        _LOGGER.debug("Getting energy level for zone %s", self._zone_number)
         zone = self._controller.get_zone(self._zone_number)
         if zone is not None:
             channel = zone.channels[0]
@@ -241,19 +242,21 @@ class RehauNeaSmart2RoomClimate(IntegrationRehauNeaSmart2Climate):
     async def async_set_preset_mode(self, preset_mode: str):
         """Set the preset mode of the climate entity."""
         mode = PRESET_ENERGY_LEVELS_MAPPING[preset_mode]
-        _LOGGER.debug(f"Setting mode to {mode}")
+        _LOGGER.debug("Setting mode to %s", mode)
         self._controller.set_energy_level({"zone": self._zone_number, "mode": mode})
+        self.async_write_ha_state()
 
     async def async_set_temperature(self, **kwargs):
         """Set the target temperature of the climate entity."""
         temperature = kwargs.get(ATTR_TEMPERATURE)
         if temperature is None:
             return
-        _LOGGER.debug(f"Setting temperature to {temperature}")
+        _LOGGER.debug("Setting temperature to %s", temperature)
         self._controller.set_temperature({"zone": self._zone_number, "temperature": temperature})
+        self.async_write_ha_state()
 
     async def async_set_hvac_mode(self, hvac_mode: str):
         """Set the HVAC mode of the climate entity."""
         operation_mode = PRESET_CLIMATE_MODES_MAPPING_REVERSE[hvac_mode]
-        _LOGGER.debug(f"Setting operation mode to {operation_mode}")
+        _LOGGER.debug("Setting operation mode to %s", operation_mode)
         self._controller.set_operation_mode(operation_mode)
@@ -1,5 +1,5 @@
 """Controller module for the REHAU NEA SMART 2 integration."""
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
 from .utils import replace_keys, EnergyLevels, OperationModes, ClientTopics
 from .handlers import update_temperature, update_energy_level, update_operating_mode
 from .models import Installation, Zone, LiveEmu
@@ -125,9 +125,11 @@ class Controller:
         Raises:
             MqttClientError: If no zone is found for the given zone number.
         """
-        for zone in self.get_zones():
-            if zone.number == zone_number:
-                return zone
+        for installation in self.get_installations_as_dict():
+            for group in installation["groups"]:
+                for zone in group["zones"]:
+                    if zone["number"] == zone_number:
+                        return Zone(**zone)
         raise MqttClientError("No zone found for zone " + str(zone_number))
 
     def get_installation_unique_by_zone(self, zone_number: int) -> str:
@@ -168,9 +170,10 @@ class Controller:
             for group in installation["groups"]:
                 for zone in group["zones"]:
                     if zone["number"] == zone_number:
-                        if len(zone["channels"]) > 1 or key != "_id":
+                        channels = zone["channels"]
+                        if len(channels) > 1 or key != "_id":
                             values = []
-                            for channel in zone["channels"]:
+                            for channel in channels:
                                 if key in channel:
                                     values.append(channel[key])
                             if len(values) == 0:
@@ -260,6 +263,7 @@ class Controller:
         )
 
         update_temperature(self.get_installations_as_dict(), payload["zone"], int_temperature)
+        self.mqtt_client.invalidate_installations()
         return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, temperature_request)
 
     def get_energy_level(self, zone: int) -> EnergyLevels:
@@ -306,6 +310,7 @@ class Controller:
         )
 
         update_energy_level(self.get_installations_as_dict(), payload["zone"], payload["mode"])
+        self.mqtt_client.invalidate_installations()
         return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, energy_level_request)
 
     def get_global_energy_level(self) -> EnergyLevels:
@@ -396,6 +401,8 @@ class Controller:
 
 
         update_operating_mode(self.get_installations_as_dict(), self.mqtt_client.get_install_id, mode)
+        self.mqtt_client.invalidate_installations()
+        self.mqtt_client.publish_updates()
         return self.mqtt_client.send_message(ClientTopics.INSTALLATION.value, operation_mode_request)
 
     def is_ready(self) -> bool:
@@ -406,21 +413,23 @@ class Controller:
         """
         return self.mqtt_client.is_ready()
 
-    def register_callback(self, callback: Callable[[], None]) -> None:
+    def register_callback(self, callback: Callable[[], None], key: Hashable | None = None) -> None:
         """Register callback, called when Roller changes state.
 
         Args:
             callback (Callable[[], None]): Callback to be called when Roller changes state.
+            key (Hashable | None): The data the callback is interested in, see MqttClient.register_callback.
         """
-        self.mqtt_client.register_callback(callback)
+        self.mqtt_client.register_callback(callback, key)
 
-    def remove_callback(self, callback: Callable[[], None]) -> None:
+    def remove_callback(self, callback: Callable[[], None], key: Hashable | None = None) -> None:
         """Remove previously registered callback.
 
         Args:
             callback (Callable[[], None]): Callback to be removed.
+            key (Hashable | None): The key the callback was registered with.
         """
-        self.mqtt_client.remove_callback(callback)
+        self.mqtt_client.remove_callback(callback, key)
 
     def get_installation_by_unique(self, installation_unique: str):
             """Return the installation."""
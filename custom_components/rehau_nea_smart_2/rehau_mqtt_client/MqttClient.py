@@ -1,13 +1,11 @@
 """MQTT client for the Rehau NEA Smart 2 integration."""
 import asyncio
-import json
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
+import orjson
 import paho.mqtt.client as mqtt
 import logging
-import schedule
+import threading
 import aiocron
-import time
-import re
 
 from .utils import generate_uuid, ServerTopics, ClientTopics
 from .handlers import handle_message, auth, refresh, parse_installations, read_user_state
@@ -21,10 +19,23 @@ from homeassistant.core import HomeAssistant
 
 _LOGGER = logging.getLogger(__name__)
 
+LIVE_EMU_KEYS = (
+    "pumpOn",
+    "mixed_circuit1_setpoint",
+    "mixed_circuit1_supply",
+    "mixed_circuit1_return",
+    "mixed_circuit1_opening",
+)
+LIVE_DIDO_KEYS = ("DI_1", "DI_2", "DI_3", "DI_4", "DI_5", "DO_1", "DO_2", "DO_3", "DO_4", "DO_5")
+
 class MqttClient:
     """MQTT client for the Rehau NEA Smart 2 integration."""
 
     MAX_CONNECT_RETRIES = 5
+    SUBSCRIBE_TOPICS = (
+        (ClientTopics.LISTEN.value, {}),
+        (ClientTopics.LISTEN_TO_CONTROLLER.value, {}),
+    )
 
     def __init__(self, hass: HomeAssistant, username, password):
         """Initialize the MQTT client.
@@ -44,6 +55,10 @@ class MqttClient:
         self.installations = None
         self.live_emus = None
         self.live_didos = None
+        self._install_by_unique: dict[str, dict] = {}
+        self._channel_index: dict[tuple[str, str], dict] = {}
+        self._live_emu_by_unique: dict[str, dict] = {}
+        self._live_dido_by_unique: dict[str, dict] = {}
         self.authenticated = False
         self.referentials = None
         self.transaction_id = None
@@ -53,17 +68,22 @@ class MqttClient:
             "unique": None,
             "hash": None,
         }
+        self._install_id = None
+        self._install_unique = None
+        self._install_hash = None
+        self._install_ids_cache: list | None = None
+        self._installations_hash = None
         self.client_id = "app-" + generate_uuid()
         self.client = None
-        self.subscribe_topics = lambda: [
-            {"topic": ClientTopics.LISTEN.value, "options": {}},
-            {"topic": ClientTopics.LISTEN_TO_CONTROLLER.value, "options": {}},
-        ]
-        self.stop_scheduler_loop = False
         self.scheduler_task = None
+        self.crontabs = []
         self.number_of_retries = 0
         self.number_of_message_failures = 0
-        self.callbacks = set()
+        self.callbacks: dict[Hashable, set[Callable[[], None]]] = {}
+        self._resolved_topics: dict[str, str] = {}
+        self._subscribed: set[str] = set()
+        self._pending_subscriptions: dict[int, str] = {}
+        self._subscriptions_lock = threading.Lock()
 
     @staticmethod
     async def check_credentials(email, password):
@@ -81,7 +101,7 @@ class MqttClient:
             MqttClientAuthenticationError: If the credentials are invalid.
         """
         valid = await auth(email, password, True)
-        _LOGGER.debug("Credentials valid: " + str(valid))
+        _LOGGER.debug("Credentials valid: %s", valid)
         if valid:
             return True
 
@@ -112,20 +132,37 @@ class MqttClient:
             flags: The connection flags.
             rc: The result code.
         """
-        _LOGGER.debug("Connected with result code " + str(rc))
+        _LOGGER.debug("Connected with result code %s", rc)
         self.authenticated = True
         self.send_topics()
         self.request_server_referentials()
 
-    async def on_message(self, client, userdata, msg):
-        """Handle the received message.
+    def on_message(self, topic: str, payload: bytes):
+        """Start handling the received message. Must run in the event loop.
+
+        Args:
+            topic: The topic the message was received on.
+            payload: The message payload.
+        """
+        self.hass.async_create_task(handle_message(topic, payload, self))
+
+    def on_subscribe(self, client, userdata, mid, granted_qos):
+        """Record a subscription once the broker has acknowledged it.
 
         Args:
             client: The MQTT client instance.
             userdata: The user data.
-            msg: The received message.
+            mid: The message ID of the subscribe request.
+            granted_qos: The QoS granted by the broker for each requested topic.
         """
-        await handle_message(msg.topic, msg.payload, self)
+        with self._subscriptions_lock:
+            topic_str = self._pending_subscriptions.pop(mid, None)
+            if topic_str is None:
+                return
+            if granted_qos and granted_qos[0] != 0x80:
+                self._subscribed.add(topic_str)
+            else:
+                _LOGGER.warning("Subscription to topic %s was rejected", topic_str)
 
     def on_disconnect(self, client, userdata, rc):
         """Log the result code when the client disconnects from the MQTT broker.
@@ -135,6 +172,9 @@ class MqttClient:
             userdata: The user data.
             rc: The result code.
         """
+        with self._subscriptions_lock:
+            self._subscribed.clear()
+            self._pending_subscriptions.clear()
         if rc != 0:
             self.number_of_retries += 1
             if self.number_of_retries <= self.MAX_CONNECT_RETRIES:
@@ -150,11 +190,17 @@ class MqttClient:
         installs = self.user["installs"]
         for install in installs:
             if install["unique"] == default_install:
+                unique_changed = install["unique"] != self._install_unique
+                self._install_id = install["_id"]
+                self._install_unique = install["unique"]
+                self._install_hash = install.get("hash")
                 self.current_installation = {
-                    "id": install["_id"],
-                    "unique": install["unique"],
-                    "hash": install["hash"] if "hash" in install else None,
+                    "id": self._install_id,
+                    "unique": self._install_unique,
+                    "hash": self._install_hash,
                 }
+                if unique_changed:
+                    self._resolve_all_topics()
                 return
 
     async def read_user_http(self):
@@ -184,6 +230,10 @@ class MqttClient:
         self.send_topics()
         await self.read_user_http()
 
+    async def minutely_refresh(self):
+        """Refresh the user data and the live data in a single scheduler run."""
+        await asyncio.gather(self.refresh_http(), self.refresh_live_data())
+
     async def refresh_live_data(self):
         _LOGGER.debug("Refreshing live data")
         payload = { "11": "REQ_LIVE", "12": { "DATA": "1" } }
@@ -215,29 +265,44 @@ class MqttClient:
     def replace_wildcards(self, topic: str):
         """Replace the wildcards in the topic with the installation ID and user mail.
 
+        Results are cached per topic template until the installation changes.
+
         Args:
             topic: The topic to replace the wildcards in.
 
         Returns:
             str: The topic with the wildcards replaced.
         """
-        replacements = {
-            "{id}": self.get_install_unique(),
-            "{email}": self.auth_username,
-        }
+        if "{" not in topic:
+            return topic
 
-        def replace(match):
-            return replacements[match.group(0)]
+        cached = self._resolved_topics.get(topic)
+        if cached is not None:
+            return cached
 
-        return re.sub(r"{id}|{email}", replace, topic, flags=re.I)
+        result = topic.replace("{id}", self.get_install_unique() or "").replace(
+            "{email}", self.auth_username or ""
+        )
+        self._resolved_topics[topic] = result
+        return result
+
+    def _resolve_all_topics(self):
+        """Resolve the wildcards of every known client and server topic for the current installation."""
+        self._resolved_topics = {}
+        for topic in (*ClientTopics, *ServerTopics):
+            self._resolved_topics[topic.value] = self.replace_wildcards(topic.value)
 
     def send_topics(self):
-        """Subscribe to the configured topics."""
-        for topic in self.subscribe_topics():
-            topic_str = self.replace_wildcards(topic["topic"])
-            _LOGGER.debug(f"Subscribing to topic: {topic_str}")
-            self.client.unsubscribe(topic_str)
-            self.client.subscribe(topic_str, **topic["options"])
+        """Subscribe to the configured topics that are not subscribed yet."""
+        for topic, options in self.SUBSCRIBE_TOPICS:
+            topic_str = self.replace_wildcards(topic)
+            if topic_str in self._subscribed:
+                continue
+            _LOGGER.debug("Subscribing to topic: %s", topic_str)
+            with self._subscriptions_lock:
+                result, mid = self.client.subscribe(topic_str, **options)
+                if result == mqtt.MQTT_ERR_SUCCESS:
+                    self._pending_subscriptions[mid] = topic_str
 
     def send_message(self, topic: str, message: dict):
         """Send a message to the MQTT broker.
@@ -252,15 +317,22 @@ class MqttClient:
         Raises:
             MqttClientCommunicationError: If there is a communication error.
         """
-        json_message = json.dumps(message)
-        topic = self.replace_wildcards(topic)
-        _LOGGER.debug(f"Sending message {topic}: {json_message}")
+        json_message = orjson.dumps(message)
+        topic = self._resolved_topics.get(topic) or self.replace_wildcards(topic)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Sending message %s: %s", topic, json_message.decode())
         result, mid = self.client.publish(topic, payload=json_message)
-        _LOGGER.debug(f"Message {topic} result: {result}")
+        _LOGGER.debug("Message %s result: %s", topic, result)
         if result != mqtt.MQTT_ERR_SUCCESS:
             self.number_of_message_failures += 1
             if self.number_of_message_failures > 5:
-                _LOGGER.error(f"Error sending message {topic}. result: {result}. Failed {self.number_of_message_failures} times. Data: {json_message}")
+                _LOGGER.error(
+                    "Error sending message %s. result: %s. Failed %s times. Data: %s",
+                    topic,
+                    result,
+                    self.number_of_message_failures,
+                    json_message.decode(),
+                )
         else:
             self.number_of_message_failures = 0
         return mid
@@ -275,10 +347,13 @@ class MqttClient:
 
     def disconnect(self):
         """Disconnect from the MQTT broker."""
-        for topic in self.subscribe_topics():
-            topic_str = self.replace_wildcards(topic["topic"])
-            _LOGGER.debug(f"Unsubscribing from topic: {topic_str}")
+        for topic, _options in self.SUBSCRIBE_TOPICS:
+            topic_str = self.replace_wildcards(topic)
+            _LOGGER.debug("Unsubscribing from topic: %s", topic_str)
             self.client.unsubscribe(topic_str)
+        with self._subscriptions_lock:
+            self._subscribed.clear()
+            self._pending_subscriptions.clear()
         self.client.disconnect()
         self.client.loop_stop()
         self.stop_scheduler()
@@ -293,7 +368,7 @@ class MqttClient:
             userdata: The user data.
             msg: The received message.
         """
-        self.hass.create_task(self.on_message(client, userdata, message))
+        self.hass.loop.call_soon_threadsafe(self.on_message, message.topic, message.payload)
 
     async def init_mqtt_client(self):
         """Initialize the MQTT client."""
@@ -307,6 +382,7 @@ class MqttClient:
         self.client.on_connect = self.on_connect
         self.client.on_message = self.on_message_callback
         self.client.on_disconnect = self.on_disconnect
+        self.client.on_subscribe = self.on_subscribe
         self.client.enable_logger(logger=_LOGGER)
         self.client.reconnect_delay_set(min_delay=30, max_delay=300)
         self.client.connect("mqtt.nea2aws.aws.rehau.cloud", 443)
@@ -329,7 +405,7 @@ class MqttClient:
             self.set_token_data(token_data)
             await self.reconnect()
         except MqttClientAuthenticationError as e:
-            _LOGGER.error("Could not refresh token: " + str(e))
+            _LOGGER.error("Could not refresh token: %s", e)
             await self.auth_user()
 
     async def set_installations(self, installations):
@@ -343,9 +419,34 @@ class MqttClient:
             self.set_install_id()
 
     async def update_installations(self, installations):
-        """Write the installations to a file."""
+        """Parse the installations, unless they are unchanged since the last update."""
+        installations_hash = hash((orjson.dumps(installations), self.last_operating_mode))
+        if installations_hash == self._installations_hash:
+            _LOGGER.debug("Installations unchanged, skipping update")
+            return
+
         self.installations = parse_installations(installations, self.last_operating_mode)
-        await self.publish_updates()
+        self._install_ids_cache = [installation["id"] for installation in self.installations]
+        self._install_by_unique = {
+            installation["unique"]: installation for installation in self.installations
+        }
+        self._channel_index = {
+            (installation["unique"], channel["id"]): channel
+            for installation in self.installations
+            for group in installation["groups"]
+            for zone in group["zones"]
+            for channel in zone["channels"]
+        }
+        self._installations_hash = installations_hash
+        self.publish_updates()
+
+    def invalidate_installations(self):
+        """Force the next installations update to reparse the server payload.
+
+        Must be called whenever the cached installations are changed locally, so
+        the next refresh overwrites the local changes with the server state.
+        """
+        self._installations_hash = None
 
     def set_token_data(self, token_data):
         """Set the authentication token data and start the refresh timer.
@@ -396,7 +497,7 @@ class MqttClient:
         if self.transaction_id is not None:
             return self.transaction_id
 
-        self.transaction_id = self.user["transactionId"] if "transactionId" in self.user else None
+        self.transaction_id = self.user.get("transactionId")
         return self.transaction_id
 
     async def set_user(self, user):
@@ -406,13 +507,15 @@ class MqttClient:
             user: The user data.
         """
         self.user = user
-        if "installs" in user:
-            if len(user["installs"]) > 0 and "user" in user["installs"][0] and "heatcool_auto_01" in user["installs"][0]["user"]:
-                self.last_operating_mode = user["installs"][0]["user"]["heatcool_auto_01"]
-                _LOGGER.debug("Setting last operating mode to " + str(self.last_operating_mode))
+        installs = user.get("installs")
+        if installs is not None:
+            install_user = installs[0].get("user") if len(installs) > 0 else None
+            if install_user is not None and "heatcool_auto_01" in install_user:
+                self.last_operating_mode = install_user["heatcool_auto_01"]
+                _LOGGER.debug("Setting last operating mode to %s", self.last_operating_mode)
 
 
-            await self.set_installations(user["installs"])
+            await self.set_installations(installs)
 
     def get_install_id(self):
         """Get the installation ID.
@@ -420,7 +523,7 @@ class MqttClient:
         Returns:
             str: The installation ID.
         """
-        return self.current_installation["id"]
+        return self._install_id
 
     def get_install_unique(self):
         """Get the installation unique.
@@ -428,7 +531,7 @@ class MqttClient:
         Returns:
             str: The installation unique.
         """
-        return self.current_installation["unique"]
+        return self._install_unique
 
     def get_install_hash(self):
         """Get the installation hash.
@@ -436,7 +539,7 @@ class MqttClient:
         Returns:
             str: The installation hash.
         """
-        return self.current_installation["hash"]
+        return self._install_hash
 
     def get_install_ids(self):
         """Get the installation IDs.
@@ -444,7 +547,7 @@ class MqttClient:
         Returns:
             list: The installation IDs.
         """
-        return [install["id"] for install in self.get_installations()]
+        return self._install_ids_cache
 
     def get_referentials(self):
         """Get the referentials.
@@ -473,59 +576,43 @@ class MqttClient:
         install_id = payload["install_id"]
 
         if self.live_emus is None:
-            self.live_emus = [{"unique": install_id }]
-
-        live_emu = next(
-            (
-                live_emu
-                for live_emu in self.live_emus
-                if live_emu["unique"] == install_id
-            ),
-            None,
-        )
+            self.live_emus = []
+
+        live_emu = self._live_emu_by_unique.get(install_id)
         if live_emu is None:
             live_emu = {"unique": install_id }
             self.live_emus.append(live_emu)
+            self._live_emu_by_unique[install_id] = live_emu
 
-        live_emu["pumpOn"] = payload["pumpOn"]
-        live_emu["mixed_circuit1_setpoint"] = payload["mixed_circuit1_setpoint"]
-        live_emu["mixed_circuit1_supply"] = payload["mixed_circuit1_supply"]
-        live_emu["mixed_circuit1_return"] = payload["mixed_circuit1_return"]
-        live_emu["mixed_circuit1_opening"] = payload["mixed_circuit1_opening"]
+        changed = False
+        for key in LIVE_EMU_KEYS:
+            if live_emu.get(key) != payload[key]:
+                live_emu[key] = payload[key]
+                changed = True
 
-        await self.publish_updates()
+        if changed:
+            self.publish_updates(("live_emu", install_id))
 
     async def update_live_dido(self, payload: dict):        
         install_id = payload["install_id"]
 
         if self.live_didos is None:
-            self.live_didos = [{"unique": install_id }]
-
-        live_dido = next(
-            (
-                live_dido
-                for live_dido in self.live_didos
-                if live_dido["unique"] == install_id
-            ),
-            None,
-        )
+            self.live_didos = []
+
+        live_dido = self._live_dido_by_unique.get(install_id)
         if live_dido is None:
             live_dido = {"unique": install_id }
             self.live_didos.append(live_dido)
+            self._live_dido_by_unique[install_id] = live_dido
 
-        live_dido["DI_1"] = payload["DI_1"]
-        live_dido["DI_2"] = payload["DI_2"]
-        live_dido["DI_3"] = payload["DI_3"]
-        live_dido["DI_4"] = payload["DI_4"]
-        live_dido["DI_5"] = payload["DI_5"]
-        live_dido["DO_1"] = payload["DO_1"]
-        live_dido["DO_2"] = payload["DO_2"]
-        live_dido["DO_3"] = payload["DO_3"]
-        live_dido["DO_4"] = payload["DO_4"]
-        live_dido["DO_5"] = payload["DO_5"]
-        
+        changed = False
+        for key in LIVE_DIDO_KEYS:
+            if live_dido.get(key) != payload[key]:
+                live_dido[key] = payload[key]
+                changed = True
 
-        await self.publish_updates()
+        if changed:
+            self.publish_updates(("live_dido", install_id))
 
     async def update_channel(self, payload: dict):
         """Update the channel with the provided payload.
@@ -541,75 +628,81 @@ class MqttClient:
         mode_used = payload["mode_used"]
         setpoint_used = payload["setpoint_used"] if payload["setpoint_used"]>0 else None
 
-        installation = next(
-            (
-                installation
-                for installation in self.installations
-                if installation["unique"] == install_id
-            ),
-            None,
-        )
-        if installation is None:
+        if install_id not in self._install_by_unique:
             raise MqttClientError("No installation found for id " + install_id)
 
-        for group in installation["groups"]:
-            for zone in group["zones"]:
-                for channel in zone["channels"]:
-                    if channel["id"] == channel_id:
-                        channel["energy_level"] = mode_used
-                        channel["target_temperature"] = setpoint_used
-                        await self.publish_updates()
-                        return
+        channel = self._channel_index.get((install_id, channel_id))
+        if channel is None:
+            raise MqttClientError("No channel found for id " + channel_id)
 
+        if channel["energy_level"] == mode_used and channel["target_temperature"] == setpoint_used:
+            return
 
-        raise MqttClientError("No channel found for id " + channel_id)
+        channel["energy_level"] = mode_used
+        channel["target_temperature"] = setpoint_used
+        self.invalidate_installations()
+        self.publish_updates(("channel", install_id, channel_id))
 
 
-    async def publish_updates(self) -> None:
-        """Publish updates to all registered callbacks."""
-        for callback in self.callbacks:
+    def publish_updates(self, key: Hashable | None = None) -> None:
+        """Publish updates to the registered callbacks.
+
+        Args:
+            key (Hashable | None): Only notify the callbacks registered for this key.
+                All callbacks are notified when no key is given.
+        """
+        if not self.callbacks:
+            return
+        if key is not None:
+            callbacks = self.callbacks.get(key, ())
+        else:
+            callbacks = set().union(*self.callbacks.values())
+        for callback in callbacks:
             callback()
 
 
-    def register_callback(self, callback: Callable[[], None]) -> None:
+    def register_callback(self, callback: Callable[[], None], key: Hashable | None = None) -> None:
         """Register callback, called when Roller changes state.
 
+        Callbacks registered without a key are only notified when the whole
+        installation tree is refreshed. Use ("channel", unique, channel_id),
+        ("live_emu", unique) or ("live_dido", unique) to also be notified of
+        changes to that channel or live data.
+
         Args:
             callback (Callable[[], None]): Callback to be called when Roller changes state.
+            key (Hashable | None): The data the callback is interested in.
         """
-        self.callbacks.add(callback)
+        self.callbacks.setdefault(key, set()).add(callback)
 
-    def remove_callback(self, callback: Callable[[], None]) -> None:
+    def remove_callback(self, callback: Callable[[], None], key: Hashable | None = None) -> None:
         """Remove previously registered callback.
 
         Args:
             callback (Callable[[], None]): Callback to be removed.
+            key (Hashable | None): The key the callback was registered with.
         """
-        self.callbacks.discard(callback)
-
-    def run_scheduler(self):
-        """Run the scheduler in a separate thread."""
-        while not self.stop_scheduler_loop:
-            schedule.run_pending()
-            time.sleep(1)
+        callbacks = self.callbacks.get(key)
+        if callbacks is not None:
+            callbacks.discard(callback)
+            if not callbacks:
+                del self.callbacks[key]
 
     async def start_scheduler_task(self):
-        """Start the scheduler in a separate thread."""
-        _LOGGER.debug("Starting scheduler thread")
-        aiocron.crontab("*/1 * * * *", func=self.refresh_http, start=True)
-        aiocron.crontab("*/1 * * * *", func=self.refresh_live_data, start=True)
-        aiocron.crontab("*/5 * * * *", func=self.request_server_referentials, start=True)
+        """Register the periodic tasks with aiocron."""
+        _LOGGER.debug("Starting scheduler")
+        self.crontabs = [
+            aiocron.crontab("*/1 * * * *", func=self.minutely_refresh, start=True),
+            aiocron.crontab("*/5 * * * *", func=self.request_server_referentials, start=True),
+        ]
         if "access_token" in self.token_data:
             _LOGGER.debug("Scheduling token refresh")
             expires_in = self.token_data["expires_in"] - 300
-            _LOGGER.debug("Token expires in " + str(expires_in) + " seconds")
+            _LOGGER.debug("Token expires in %s seconds", expires_in)
             # aiocron.crontab(f"*/{expires_in} * * * *", func=self.refresh_token, start=True)
         else:
             _LOGGER.error("No access token found")
 
-        while not self.stop_scheduler_loop:
-            await asyncio.sleep(1)
-
     def start_scheduler(self):
         """Start the scheduler to run periodic tasks."""
         self.scheduler_task = asyncio.create_task(self.start_scheduler_task(), name="Rehau NEA Smart 2 Scheduler")
@@ -617,7 +710,9 @@ class MqttClient:
     def stop_scheduler(self):
         """Stop the scheduler."""
         _LOGGER.debug("Stopping scheduler")
-        self.stop_scheduler_loop = True
+        for crontab in self.crontabs:
+            crontab.stop()
+        self.crontabs = []
         if self.scheduler_task:
             self.scheduler_task.cancel()
             self.scheduler_task = None
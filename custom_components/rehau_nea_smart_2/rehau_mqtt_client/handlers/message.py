@@ -9,7 +9,7 @@ _LOGGER = logging.getLogger(__name__)
 
 async def handle_message(topic: str, payload: str, client):
     """Handle MQTT message."""
-    _LOGGER.debug("Handling message: " + topic)
+    _LOGGER.debug("Handling message: %s", topic)
     if topic == "$client/app":
         await handle_app_message(payload, client)
     else:
@@ -19,17 +19,17 @@ async def handle_message(topic: str, payload: str, client):
 async def handle_app_message(payload: str, client):
     """Handle app message."""
     message = json.loads(payload)
-    _LOGGER.debug("Handling app message: " + message["type"])
+    _LOGGER.debug("Handling app message: %s", message["type"])
     if message["type"] == "auth_user":
         await handle_user_auth(message, client)
     else:
-        _LOGGER.debug("Unhandled app message: " + message["type"])
+        _LOGGER.debug("Unhandled app message: %s", message["type"])
 
 
 async def handle_user_message(payload: str, client):
     """Handle user message."""
     message = json.loads(payload)
-    _LOGGER.debug("Handling user message: " + message["type"])
+    _LOGGER.debug("Handling user message: %s", message["type"])
     if message["type"] == "read_user":
         await handle_user_read(message, client)
     elif message["type"] == "channel_update":
@@ -39,7 +39,7 @@ async def handle_user_message(payload: str, client):
     elif message["type"] == "live_data":
         await handle_live_data(message, client)        
     else:
-        _LOGGER.debug("Unhandled user message: " + message["type"])
+        _LOGGER.debug("Unhandled user message: %s", message["type"])
 
 
 async def handle_user_read(message: dict, client):
@@ -59,7 +59,7 @@ async def handle_channel_update(message, client):
     data = message["data"]["data"]
     mode_used = data["mode_used"]
     setpoint_used = data["setpoint_used"]
-    _LOGGER.debug(f"Channel {channel_id} updated to {mode_used} {setpoint_used}")
+    _LOGGER.debug("Channel %s updated to %s %s", channel_id, mode_used, setpoint_used)
     await client.update_channel({
         "channel_id": channel_id,
         "install_id": unique,
@@ -104,4 +104,4 @@ async def handle_live_data(message, client):
         })
     
 
-    _LOGGER.debug("live data: {0}".format(message))
+    _LOGGER.debug("live data: %s", message)
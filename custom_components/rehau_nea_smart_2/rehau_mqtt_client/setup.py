@@ -19,5 +19,6 @@ setup(
         'pydantic==2.6.3',
         'deepmerge==1.1.1',
         'aiocron==1.8',
+        'orjson==3.9.15',
     ],
 )
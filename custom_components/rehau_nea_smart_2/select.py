@@ -107,9 +107,9 @@ class RehauNeaSmart2OperationModeSelect(RehauNeaSmart2GenericSelect):
     async def async_select_option(self, mode: str) -> None:
         """Select an operation mode."""
         mode = PRESET_OPERATING_MODES_MAPPING[mode]
-        _LOGGER.debug(f"Setting operation mode to {mode}")
+        _LOGGER.debug("Setting operation mode to %s", mode)
         if not self._controller.set_operation_mode(mode):
-            _LOGGER.error(f"Error configuring {mode} operation climate mode")
+            _LOGGER.error("Error configuring %s operation climate mode", mode)
 
     @property
     def current_option(self):
@@ -154,9 +154,9 @@ class RehauNeaSmart2OperationEnergyLevelSelect(RehauNeaSmart2GenericSelect):
                 None
             """
             energy_level = PRESET_ENERGY_LEVELS_MAPPING[energy_level]
-            _LOGGER.debug(f"Setting energy level to {energy_level}")
+            _LOGGER.debug("Setting energy level to %s", energy_level)
             if not self._controller.set_global_energy_level({"mode": energy_level}):
-                _LOGGER.error(f"Error configuring {energy_level} energy level")
+                _LOGGER.error("Error configuring %s energy level", energy_level)
 
 
     @property
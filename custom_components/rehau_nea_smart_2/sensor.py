@@ -265,6 +265,7 @@ class RehauNeasmart2LiveEmuTemperatureSensor(SensorEntity, RestoreEntity):
         self._name = f"{name}"
         self._propertyname = propertyname
         self._live_emu_unique = live_emu["unique"]
+        self._callback_key = ("live_emu", self._live_emu_unique)
         self._state = round((live_emu.get(propertyname) / 10 - 32) / 1.8, 1) if live_emu.get(propertyname) is not None else None
         self._unique_name = name.lower().replace(" ", "_")
         self._attr_unique_id = f"{self._live_emu_unique}_{self._unique_name}"
@@ -273,11 +274,11 @@ class RehauNeasmart2LiveEmuTemperatureSensor(SensorEntity, RestoreEntity):
 
     async def async_added_to_hass(self) -> None:
         """Run when this Entity has been added to HA."""
-        self._controller.register_callback(self.async_write_ha_state)
+        self._controller.register_callback(self.async_write_ha_state, self._callback_key)
 
     async def async_will_remove_from_hass(self):
         """Run when this Entity will be removed from HA."""
-        self._controller.remove_callback(self.async_write_ha_state)
+        self._controller.remove_callback(self.async_write_ha_state, self._callback_key)
 
     @property
     def device_info(self):